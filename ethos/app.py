@@ -1,4 +1,5 @@
 from ethos.core.data_processing import DataProcessor
+from ethos.core.anomaly_detector import AnomalyDetector
 from ethos.ml.location_predictor import LocationPredictor
 from ethos.ui.dashboard import DashboardApp
 from ethos import config
@@ -10,6 +11,7 @@ class App:
     def __init__(self):
         self.data_processor = DataProcessor(data_directory=config.CLEAN_DATA_DIR)
         self.location_predictor = LocationPredictor(model_dir=config.MODEL_DIR)
+        self.anomaly_detector = AnomalyDetector(self.data_processor.all_data)
 
     def run(self):
         """
@@ -23,7 +25,7 @@ class App:
         # --- To switch between UIs, comment/uncomment the following lines ---
 
         # --- Old CustomTkinter UI ---
-        dashboard = DashboardApp(self.data_processor, self.location_predictor)
+        dashboard = DashboardApp(self.data_processor, self.location_predictor, self.anomaly_detector)
         dashboard.run()
 
         # --- New Flet UI ---
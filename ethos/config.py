@@ -19,3 +19,17 @@ FACE_IMAGE_DIR = os.path.join(SOURCE_DATA_DIR, "face_images")
 LOCATION_PREDICTOR_N_ESTIMATORS = 50
 LOCATION_PREDICTOR_TEST_SIZE = 0.2
 LOCATION_PREDICTOR_RANDOM_STATE = 42
+
+# --- ANOMALY DETECTION ---
+ANOMALY_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+ANOMALY_MIN_TRAVEL_SECONDS = 300        # Two different locations closer than this in time is impossible travel
+ANOMALY_DEVICE_MISMATCH_SECONDS = 120   # Swipe vs. WiFi association at a different location within this window
+ANOMALY_BOOKING_GRACE_SECONDS = 900     # Presence this long before a booking starts still counts as attendance
+ANOMALY_LOCATION_ALIASES = {}           # Optional map of AP/room IDs to the canonical location_id they belong to
+ANOMALY_LOCATION_TRANSIT_SECONDS = {}   # Optional {(location_a, location_b): seconds} overrides, either direction; 0 marks adjacent locations
+ANOMALY_SEVERITY_WEIGHTS = {
+    "Impossible Travel": 3.0,
+    "Card/Device Mismatch": 2.0,
+    "Unverified Attendance": 2.5,
+    "Booking No-Show": 1.0,
+}
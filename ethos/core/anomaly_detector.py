@@ -0,0 +1,332 @@
+import pandas as pd
+from ethos import config
+
+class AnomalyDetector:
+    """
+    Cross-checks card swipes, WiFi associations, CCTV sightings and lab bookings
+    for every entity and produces ranked security alerts.
+
+    All checks are vectorized sorted sweeps over a single presence table, so a
+    full semester of logs is scanned without per-entity Python loops.
+    """
+    CARD_SOURCE = 'Card Swipe'
+    WIFI_SOURCE = 'WiFi Connection'
+    CCTV_SOURCE = 'Camera/Facial Rec'
+
+    # (filename, profile key column, location column, source label)
+    PRESENCE_SOURCES = [
+        ('campus card_swipes.csv', 'card_id', 'location_id', CARD_SOURCE),
+        ('wifi_associations_logs.csv', 'device_hash', 'ap_id', WIFI_SOURCE),
+        ('cctv_frames.csv', 'face_id', 'location_id', CCTV_SOURCE),
+    ]
+    # WiFi is excluded from travel checks: neighbouring APs overlap physically.
+    TRAVEL_SOURCES = [CARD_SOURCE, CCTV_SOURCE]
+    BOOKINGS_FILENAME = 'lab_bookings.csv'
+    ATTENDED_COL = 'attended (YES/NO)'
+    # Clean CSVs the detector reads; callers reloading data only need these.
+    SOURCE_FILENAMES = [config.PROFILES_CLEANED_FILENAME] + [source[0] for source in PRESENCE_SOURCES] + [BOOKINGS_FILENAME]
+    ALERT_COLUMNS = ['timestamp', 'entity_id', 'anomaly_type', 'location_id', 'details', 'score']
+
+    def __init__(self, clean_data):
+        self.clean_data = clean_data
+        self.watermark = None
+        self.alerts_df = self._empty_alerts()
+        self._events = None
+        self._transit_overrides = self._build_transit_overrides()
+
+    def run_full_scan(self):
+        """Discards previous results and scans every event in the loaded data."""
+        self.watermark = None
+        self.alerts_df = self._empty_alerts()
+        self._events = None
+        return self._scan()
+
+    def run_incremental_scan(self, clean_data=None):
+        """
+        Scans only events newer than the last scan's watermark, appending any new alerts.
+        Pass freshly reloaded `clean_data` to pick up appended logs; rows newer than the
+        watermark are timestamp-parsed, mapped to entities and appended to the cached presence
+        table. Events arriving with timestamps at or before the watermark are not revisited.
+        """
+        if clean_data is not None:
+            self.clean_data = clean_data
+        if self.watermark is None:
+            return self.run_full_scan()
+        if clean_data is not None:
+            new_events = self._build_presence_events(since=self.watermark)
+            if not new_events.empty:
+                # New rows are all later than the watermark, so appending keeps the table time-sorted.
+                self._events = pd.concat([self._get_events(), new_events], ignore_index=True)
+        return self._scan(since=self.watermark)
+
+    def get_ranked_alerts(self, limit=None):
+        ranked = self.alerts_df.sort_values(['score', 'timestamp'], ascending=[False, False], kind='mergesort')
+        return ranked if limit is None else ranked.head(limit)
+
+    def format_alerts(self, limit=50):
+        ranked = self.get_ranked_alerts(limit)
+        header = f"\nANOMALY ALERTS ({len(self.alerts_df)} total, showing top {len(ranked)})\n{'='*30}\n"
+        if ranked.empty:
+            return header + "No anomalies detected."
+
+        formatted_alerts = header
+        for rank, alert in enumerate(ranked.itertuples(index=False), start=1):
+            formatted_alerts += f"[{rank}] {alert.timestamp} | {alert.anomaly_type.upper()} | Score: {alert.score:.2f}\n"
+            formatted_alerts += f"    Entity Id: {alert.entity_id}\n"
+            formatted_alerts += f"    Location Id: {alert.location_id}\n"
+            formatted_alerts += f"    Details: {alert.details}\n\n"
+        return formatted_alerts.rstrip('\n')
+
+    def _scan(self, since=None):
+        all_events = self._get_events()
+        if all_events.empty:
+            print("No presence events available for anomaly detection.")
+            return self.alerts_df
+
+        watermark = all_events['timestamp'].max()
+        bookings = self._get_pending_bookings(since, watermark)
+        # Derived from the untrimmed table so incremental scans filter exactly like full scans.
+        reader_locations = all_events.loc[all_events['source'] == self.CARD_SOURCE, 'location_id'].unique()
+        observed_locations = all_events['location_id'].unique()
+
+        events = all_events
+        if since is not None:
+            # A swipe just before `since` may pair with WiFi up to one mismatch window earlier still.
+            context = pd.Timedelta(seconds=max(self._max_transit_seconds(), 2 * config.ANOMALY_DEVICE_MISMATCH_SECONDS))
+            cutoff = since - context
+            if not bookings.empty:
+                cutoff = min(cutoff, bookings['window_start'].min())
+            events = events[events['timestamp'] > cutoff]
+
+        new_alerts = [
+            self._detect_impossible_travel(events, since),
+            self._detect_device_mismatch(events, since, reader_locations),
+            self._detect_unverified_bookings(events, bookings, observed_locations),
+        ]
+        new_alerts = [alerts for alerts in new_alerts if not alerts.empty]
+        if new_alerts:
+            previous_alerts = [] if self.alerts_df.empty else [self.alerts_df]
+            combined = pd.concat(previous_alerts + new_alerts, ignore_index=True)
+            self.alerts_df = combined.drop_duplicates(subset=['anomaly_type', 'entity_id', 'timestamp', 'location_id']).reset_index(drop=True)
+
+        self.watermark = watermark
+        print(f"Anomaly scan complete. {sum(len(alerts) for alerts in new_alerts)} new alert(s), {len(self.alerts_df)} total.")
+        return self.alerts_df
+
+    def _get_events(self):
+        if self._events is None:
+            self._events = self._build_presence_events()
+        return self._events
+
+    def _build_presence_events(self, since=None):
+        """Resolves every swipe, WiFi association and CCTV sighting (newer than `since`, if given) to an entity_id."""
+        profiles = self.clean_data.get(config.PROFILES_CLEANED_FILENAME, pd.DataFrame())
+        if 'entity_id' not in profiles.columns:
+            return pd.DataFrame(columns=['entity_id', 'timestamp', 'location_id', 'source'])
+
+        frames = []
+        for filename, key_col, loc_col, source in self.PRESENCE_SOURCES:
+            df = self.clean_data.get(filename)
+            if df is None or df.empty or key_col not in profiles.columns:
+                continue
+            if not {key_col, loc_col, 'timestamp'}.issubset(df.columns):
+                continue
+
+            logs = df[[key_col, loc_col, 'timestamp']].dropna()
+            if since is not None:
+                logs = logs[self._is_after(logs['timestamp'], since)]
+                if logs.empty:
+                    continue
+
+            id_map = profiles[['entity_id', key_col]].dropna()
+            id_map = pd.DataFrame({'entity_id': self._normalize_ids(id_map['entity_id']), key_col: self._normalize_ids(id_map[key_col])})
+            id_map = id_map.drop_duplicates(subset=[key_col])
+            logs = logs.assign(**{key_col: self._normalize_ids(logs[key_col])}).merge(id_map, on=key_col, how='inner')
+            frames.append(pd.DataFrame({
+                'entity_id': logs['entity_id'],
+                'timestamp': self._parse_timestamps(logs['timestamp']),
+                'location_id': self._normalize_locations(logs[loc_col]),
+                'source': source,
+            }))
+
+        if not frames:
+            return pd.DataFrame(columns=['entity_id', 'timestamp', 'location_id', 'source'])
+        events = pd.concat(frames, ignore_index=True).dropna(subset=['timestamp', 'location_id'])
+        return events.sort_values('timestamp', kind='mergesort').reset_index(drop=True)
+
+    def _get_pending_bookings(self, since, watermark):
+        """Returns bookings whose window closed after `since` and no later than `watermark`."""
+        df = self.clean_data.get(self.BOOKINGS_FILENAME)
+        required = {'entity_id', 'room_id', 'start_time', 'end_time'}
+        if df is None or df.empty or not required.issubset(df.columns):
+            return pd.DataFrame()
+        df = df.dropna(subset=list(required))
+        if since is not None:
+            df = df[self._is_after(df['end_time'], since)]
+
+        bookings = pd.DataFrame({
+            'entity_id': self._normalize_ids(df['entity_id']),
+            'location_id': self._normalize_locations(df['room_id']),
+            'start_time': self._parse_timestamps(df['start_time']),
+            'end_time': self._parse_timestamps(df['end_time']),
+            'attended': df[self.ATTENDED_COL].astype(str).str.strip().str.upper() if self.ATTENDED_COL in df.columns else 'UNKNOWN',
+        }).dropna()
+
+        closed = bookings['end_time'] <= watermark
+        if since is not None:
+            closed &= bookings['end_time'] > since
+        bookings = bookings[closed]
+        return bookings.assign(window_start=bookings['start_time'] - pd.Timedelta(seconds=config.ANOMALY_BOOKING_GRACE_SECONDS))
+
+    def _detect_impossible_travel(self, events, since):
+        """Flags consecutive sightings of one entity at different locations closer in time than any real transit."""
+        moves = events[events['source'].isin(self.TRAVEL_SOURCES)].sort_values(['entity_id', 'timestamp'], kind='mergesort')
+        previous = moves.shift()
+        gap = (moves['timestamp'] - previous['timestamp']).dt.total_seconds()
+
+        mask = (moves['entity_id'] == previous['entity_id']) & (moves['location_id'] != previous['location_id'])
+        mask &= gap < self._max_transit_seconds()
+        if since is not None:
+            mask &= moves['timestamp'] > since
+
+        hits, prev_hits, gap = moves[mask], previous[mask], gap[mask]
+        threshold = self._transit_thresholds(prev_hits['location_id'], hits['location_id'])
+        # Adjacent pairs have a threshold of 0 and can never fall below it.
+        within = gap < threshold
+        hits, prev_hits, gap, threshold = hits[within], prev_hits[within], gap[within], threshold[within]
+        details = (
+            "Seen at " + prev_hits['location_id'].astype(str) + " (" + prev_hits['source'] + ") then "
+            + hits['location_id'].astype(str) + " (" + hits['source'] + ") "
+            + gap.round().astype(int).astype(str) + "s later"
+        )
+        return self._make_alerts(hits, 'Impossible Travel', details, gap / threshold)
+
+    def _detect_device_mismatch(self, events, since, reader_locations):
+        """Flags card swipes where the entity's device is associated to a different location at the same time."""
+        swipes = events[events['source'] == self.CARD_SOURCE]
+        wifi = events[events['source'] == self.WIFI_SOURCE]
+        if swipes.empty or wifi.empty:
+            return self._empty_alerts()
+
+        wifi = wifi[['entity_id', 'timestamp', 'location_id']].rename(columns={'timestamp': 'wifi_timestamp', 'location_id': 'wifi_location_id'})
+        paired = pd.merge_asof(
+            swipes, wifi, left_on='timestamp', right_on='wifi_timestamp', by='entity_id',
+            direction='nearest', tolerance=pd.Timedelta(seconds=config.ANOMALY_DEVICE_MISMATCH_SECONDS)
+        )
+
+        # Only compare APs that map onto a known card-reader location; see ANOMALY_LOCATION_ALIASES.
+        mask = paired['wifi_location_id'].isin(reader_locations) & (paired['wifi_location_id'] != paired['location_id'])
+        if since is not None:
+            mask &= (paired['timestamp'] > since) | (paired['wifi_timestamp'] > since)
+
+        hits = paired[mask]
+        gap = (hits['timestamp'] - hits['wifi_timestamp']).abs().dt.total_seconds()
+        details = (
+            "Card swiped at " + hits['location_id'].astype(str) + " while device associated at "
+            + hits['wifi_location_id'].astype(str) + " (" + gap.round().astype(int).astype(str) + "s apart)"
+        )
+        return self._make_alerts(hits, 'Card/Device Mismatch', details, gap / config.ANOMALY_DEVICE_MISMATCH_SECONDS)
+
+    def _detect_unverified_bookings(self, events, bookings, observed_locations):
+        """Flags bookings with no swipe, WiFi or CCTV presence in the booked room during the booked window."""
+        if bookings.empty:
+            return self._empty_alerts()
+
+        # Rooms never observed by any sensor cannot be corroborated either way.
+        bookings = bookings[bookings['location_id'].isin(observed_locations)]
+        presence = events[['entity_id', 'location_id', 'timestamp']].rename(columns={'timestamp': 'seen_at'})
+        matched = pd.merge_asof(
+            bookings.sort_values('window_start', kind='mergesort'), presence,
+            left_on='window_start', right_on='seen_at', by=['entity_id', 'location_id'], direction='forward'
+        )
+
+        unverified = matched[matched['seen_at'].isna() | (matched['seen_at'] > matched['end_time'])]
+        claimed = unverified['attended'] == 'YES'
+        details = (
+            "Booked " + unverified['start_time'].dt.strftime(config.ANOMALY_TIMESTAMP_FORMAT) + " to "
+            + unverified['end_time'].dt.strftime(config.ANOMALY_TIMESTAMP_FORMAT)
+            + " (attended: " + unverified['attended'] + ") with no presence recorded in the room"
+        )
+        hits = unverified.rename(columns={'start_time': 'timestamp'})
+        return pd.concat([
+            self._make_alerts(hits[claimed], 'Unverified Attendance', details[claimed]),
+            self._make_alerts(hits[~claimed], 'Booking No-Show', details[~claimed]),
+        ], ignore_index=True)
+
+    def _make_alerts(self, hits, anomaly_type, details, closeness=None):
+        """Builds alert rows; `closeness` in [0, 1) boosts the score as the interval shrinks toward zero."""
+        weight = config.ANOMALY_SEVERITY_WEIGHTS.get(anomaly_type, 1.0)
+        score = weight if closeness is None else weight * (2 - closeness.clip(0, 1))
+        return pd.DataFrame({
+            'timestamp': hits['timestamp'],
+            'entity_id': hits['entity_id'],
+            'anomaly_type': anomaly_type,
+            'location_id': hits['location_id'],
+            'details': details,
+            'score': score,
+        }, columns=self.ALERT_COLUMNS).astype({'score': float}).reset_index(drop=True)
+
+    @classmethod
+    def _empty_alerts(cls):
+        return pd.DataFrame({
+            'timestamp': pd.Series(dtype='datetime64[ns]'),
+            'entity_id': pd.Series(dtype=object),
+            'anomaly_type': pd.Series(dtype=object),
+            'location_id': pd.Series(dtype=object),
+            'details': pd.Series(dtype=object),
+            'score': pd.Series(dtype=float),
+        }, columns=cls.ALERT_COLUMNS)
+
+    @staticmethod
+    def _build_transit_overrides():
+        """Indexes ANOMALY_LOCATION_TRANSIT_SECONDS by (from, to) in both directions."""
+        pairs, seconds = [], []
+        for (location_a, location_b), transit in config.ANOMALY_LOCATION_TRANSIT_SECONDS.items():
+            pairs += [(str(location_a), str(location_b)), (str(location_b), str(location_a))]
+            seconds += [float(transit)] * 2
+        if not pairs:
+            return pd.Series(dtype=float)
+        overrides = pd.Series(seconds, index=pd.MultiIndex.from_tuples(pairs))
+        return overrides[~overrides.index.duplicated()]
+
+    def _max_transit_seconds(self):
+        return max([float(config.ANOMALY_MIN_TRAVEL_SECONDS)] + self._transit_overrides.tolist())
+
+    def _transit_thresholds(self, from_locations, to_locations):
+        """Per-move minimum transit time: the configured pair override, else the global threshold."""
+        thresholds = pd.Series(float(config.ANOMALY_MIN_TRAVEL_SECONDS), index=to_locations.index)
+        if self._transit_overrides.empty or to_locations.empty:
+            return thresholds
+        pairs = pd.MultiIndex.from_arrays([from_locations.astype(str), to_locations.astype(str)])
+        overrides = self._transit_overrides.reindex(pairs).to_numpy()
+        return thresholds.where(pd.isna(overrides), overrides)
+
+    @staticmethod
+    def _is_after(raw_timestamps, since):
+        """Cheap pre-filter on unparsed clean timestamps, which sort lexicographically."""
+        return raw_timestamps.astype(str) > since.strftime(config.ANOMALY_TIMESTAMP_FORMAT)
+
+    @staticmethod
+    def _parse_timestamps(series):
+        return pd.to_datetime(series, format=config.ANOMALY_TIMESTAMP_FORMAT, errors='coerce')
+
+    @staticmethod
+    def _normalize_ids(series):
+        """Stringifies non-null IDs so merge keys share a dtype whether the CSV column was read as text or numbers."""
+        return series.astype(str).str.strip()
+
+    @classmethod
+    def _normalize_locations(cls, series):
+        """Expects non-null values; applies ANOMALY_LOCATION_ALIASES after normalizing."""
+        locations = cls._normalize_ids(series)
+        if config.ANOMALY_LOCATION_ALIASES:
+            locations = locations.replace(config.ANOMALY_LOCATION_ALIASES)
+        return locations
+
+if __name__ == "__main__":
+    # Example of how to run a scan over the cleaned data
+    # Assumes the script is run from the project root
+    from ethos.core.data_processing import DataProcessor
+    detector = AnomalyDetector(DataProcessor().all_data)
+    detector.run_full_scan()
+    print(detector.format_alerts())
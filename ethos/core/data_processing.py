@@ -14,11 +14,20 @@ class DataProcessor:
             cleaner = Sweeper.DataCleaner()
             cleaner.run_cleaning_pipeline()
             return {}
+        return self.read_clean_csvs()
 
+    def read_clean_csvs(self, filenames=None):
+        """
+        Reads clean CSVs (optionally only `filenames`) into a new dict, leaving `all_data` untouched.
+        Each file is re-read in full; it never runs the cleaning pipeline.
+        """
         all_dataframes = {}
+        if not os.path.exists(self.data_directory):
+            return all_dataframes
+
         print(f"Loading data from '{self.data_directory}'...")
         for filename in os.listdir(self.data_directory):
-            if filename.endswith(".csv"):
+            if filename.endswith(".csv") and (filenames is None or filename in filenames):
                 file_path = os.path.join(self.data_directory, filename)
                 try:
                     all_dataframes[filename] = pd.read_csv(file_path, low_memory=False)
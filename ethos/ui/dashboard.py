@@ -1,6 +1,8 @@
 import customtkinter
 import pandas as pd
 import os
+import queue
+import threading
 from PIL import Image
 from ethos import config
 
@@ -11,9 +13,11 @@ class DashboardApp:
     PLACEHOLDER_TEXT = config.PLACEHOLDER_TEXT
     FACE_IMAGE_DIR = config.FACE_IMAGE_DIR
 
-    def __init__(self, data_processor, location_predictor):
+    def __init__(self, data_processor, location_predictor, anomaly_detector=None):
         self.data_processor = data_processor
         self.location_predictor = location_predictor
+        self.anomaly_detector = anomaly_detector
+        self.anomaly_results = queue.Queue()
         self.profiles_df = data_processor.profiles_df
         self.all_entity_identifiers = self._get_all_entity_identifiers()
 
@@ -51,6 +55,12 @@ class DashboardApp:
         self.entity_combobox.bind("<KeyRelease>", self._dynamic_combobox_filter)
         self.entity_combobox.pack(side="left", padx=(10, 5), pady=10, fill="x", expand=True)
         customtkinter.CTkButton(control_frame, text="Search Profiles", command=self._search_button_callback).pack(side="left", padx=(10, 10), pady=10)
+        if self.anomaly_detector is not None:
+            self.anomaly_button = customtkinter.CTkButton(
+                control_frame, text="Anomalies 🚨", width=120, fg_color="#8B0000", hover_color="#C70039",
+                command=self._anomaly_scan_callback
+            )
+            self.anomaly_button.pack(side="left", padx=(0, 10), pady=10)
 
         # Results Frame
         self.results_label = customtkinter.CTkLabel(self.app, text="Profile Matches", font=customtkinter.CTkFont(weight="bold"))
@@ -223,3 +233,34 @@ class DashboardApp:
         if last_location:
             prediction_result = self.location_predictor.predict(entity_id, last_location)
             self.result_textbox.insert("end", f"RESULT: {prediction_result}")
+
+    def _anomaly_scan_callback(self):
+        self._show_timeline_view()
+        self.result_textbox.delete("1.0", "end")
+        self.result_textbox.insert("1.0", "Scanning campus logs for anomalies...\n")
+        self.anomaly_button.configure(state="disabled", text="Scanning...")
+        threading.Thread(target=self._run_anomaly_scan, daemon=True).start()
+        self.app.after(100, self._poll_anomaly_results)
+
+    def _run_anomaly_scan(self):
+        # Runs off the Tk main loop and must not touch widgets. The first scan covers the data loaded
+        # at startup; later scans re-read the detector's CSVs into a private snapshot, but only rows
+        # newer than the previous scan are parsed, mapped and checked.
+        try:
+            clean_data = None
+            if self.anomaly_detector.watermark is not None:
+                clean_data = self.data_processor.read_clean_csvs(self.anomaly_detector.SOURCE_FILENAMES) or None
+            self.anomaly_detector.run_incremental_scan(clean_data)
+            result_text = self.anomaly_detector.format_alerts()
+        except Exception as e:
+            result_text = f"ERROR during anomaly scan: {e}"
+        self.anomaly_results.put(result_text)
+
+    def _poll_anomaly_results(self):
+        try:
+            result_text = self.anomaly_results.get_nowait()
+        except queue.Empty:
+            self.app.after(100, self._poll_anomaly_results)
+            return
+        self.anomaly_button.configure(state="normal", text="Anomalies 🚨")
+        self.result_textbox.insert("end", result_text)
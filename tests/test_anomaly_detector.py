@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+from ethos import config
+from ethos.core.anomaly_detector import AnomalyDetector
+
+SORT_COLS = ['anomaly_type', 'entity_id', 'timestamp']
+
+
+def _campus_data(numeric_ids=False):
+    """Two entities whose logs raise one alert of each kind; numeric_ids mimics integer CSV columns."""
+    entity = (lambda i: i) if numeric_ids else (lambda i: f'E{i}')
+    card = (lambda i: 100 + i) if numeric_ids else (lambda i: f'C{i}')
+    device = (lambda i: 200 + i) if numeric_ids else (lambda i: f'D{i}')
+    face = (lambda i: 300 + i) if numeric_ids else (lambda i: f'F{i}')
+
+    profiles = pd.DataFrame({
+        'entity_id': [entity(1), entity(2)],
+        'card_id': [card(1), card(2)],
+        'device_hash': [device(1), device(2)],
+        'face_id': [face(1), face(2)],
+    })
+    swipes = pd.DataFrame([
+        (card(2), 'GYM', '2024-01-01 08:00:00'),
+        (card(1), 'LIBRARY', '2024-01-01 09:00:00'),
+        (card(1), 'LAB_101', '2024-01-01 12:00:00'),
+        (card(1), 'LAB_202', '2024-01-01 12:01:00'),
+    ], columns=['card_id', 'location_id', 'timestamp'])
+    wifi = pd.DataFrame([
+        (device(1), 'LIBRARY', '2024-01-01 09:00:10'),
+        (device(1), 'GYM', '2024-01-01 12:00:30'),
+    ], columns=['device_hash', 'ap_id', 'timestamp'])
+    cctv = pd.DataFrame([(face(2), 'LAB_303', '2024-01-01 07:00:00')], columns=['face_id', 'location_id', 'timestamp'])
+    bookings = pd.DataFrame([
+        (entity(2), 'LAB_303', '2024-01-01 10:00:00', '2024-01-01 11:00:00', 'YES'),
+        (entity(1), 'LAB_101', '2024-01-01 11:30:00', '2024-01-01 11:59:00', 'NO'),
+    ], columns=['entity_id', 'room_id', 'start_time', 'end_time', 'attended (YES/NO)'])
+    return _snapshot(profiles, swipes, wifi, cctv, bookings)
+
+
+def _snapshot(profiles, swipes, wifi, cctv, bookings, until='9999'):
+    return {
+        config.PROFILES_CLEANED_FILENAME: profiles,
+        'campus card_swipes.csv': swipes[swipes['timestamp'] <= until],
+        'wifi_associations_logs.csv': wifi[wifi['timestamp'] <= until],
+        'cctv_frames.csv': cctv[cctv['timestamp'] <= until],
+        'lab_bookings.csv': bookings,
+    }
+
+
+def _truncate(data, until):
+    return _snapshot(*(data[name] for name in [
+        config.PROFILES_CLEANED_FILENAME, 'campus card_swipes.csv', 'wifi_associations_logs.csv',
+        'cctv_frames.csv', 'lab_bookings.csv',
+    ]), until=until)
+
+
+def _incremental_matches_full(data, split_at):
+    full = AnomalyDetector(data).run_full_scan()
+    detector = AnomalyDetector(_truncate(data, split_at))
+    detector.run_full_scan()
+    incremental = detector.run_incremental_scan(data)
+    pd.testing.assert_frame_equal(
+        full.sort_values(SORT_COLS).reset_index(drop=True),
+        incremental.sort_values(SORT_COLS).reset_index(drop=True),
+    )
+    return full
+
+
+@pytest.mark.parametrize('numeric_ids', [False, True])
+def test_incremental_scan_matches_full_scan(numeric_ids):
+    alerts = _incremental_matches_full(_campus_data(numeric_ids), '2024-01-01 09:30:00')
+
+    assert sorted(alerts['anomaly_type']) == [
+        'Booking No-Show', 'Card/Device Mismatch', 'Card/Device Mismatch', 'Impossible Travel', 'Unverified Attendance',
+    ]
+    assert alerts['score'].dtype == float
+    assert pd.api.types.is_datetime64_any_dtype(alerts['timestamp'])
+
+
+def test_incremental_context_keeps_nearest_wifi(monkeypatch):
+    # The swipe's nearest association (same room, 95s earlier) lies beyond the travel window before the watermark.
+    monkeypatch.setattr(config, 'ANOMALY_MIN_TRAVEL_SECONDS', 10)
+    monkeypatch.setattr(config, 'ANOMALY_DEVICE_MISMATCH_SECONDS', 120)
+    data = _campus_data()
+    data['campus card_swipes.csv'] = pd.DataFrame([
+        ('C2', 'GYM', '2024-01-01 08:00:00'),
+        ('C1', 'LAB_101', '2024-01-01 12:00:00'),
+    ], columns=['card_id', 'location_id', 'timestamp'])
+    data['wifi_associations_logs.csv'] = pd.DataFrame([
+        ('D1', 'LAB_101', '2024-01-01 11:58:25'),
+        ('D1', 'GYM', '2024-01-01 12:01:45'),
+    ], columns=['device_hash', 'ap_id', 'timestamp'])
+    data['cctv_frames.csv'] = pd.DataFrame(
+        [('F2', 'GYM', '2024-01-01 12:01:40')], columns=['face_id', 'location_id', 'timestamp'])
+
+    alerts = _incremental_matches_full(data, '2024-01-01 12:01:40')
+
+    assert 'Card/Device Mismatch' not in set(alerts['anomaly_type'])
+
+
+def test_adjacent_locations_are_not_impossible_travel(monkeypatch):
+    monkeypatch.setattr(config, 'ANOMALY_LOCATION_TRANSIT_SECONDS', {('LAB_202', 'LAB_101'): 0})
+
+    alerts = AnomalyDetector(_campus_data()).run_full_scan()
+
+    assert 'Impossible Travel' not in set(alerts['anomaly_type'])